@@ -1,10 +1,13 @@
 import tomllib
 
 import logfire
+import uvicorn
 from fastmcp import FastMCP
 
 from src.settings import settings
 from src.tools import TOOLS
+from src.tools.collection.resilience import with_deadline
+from src.tools.points.common import download_embedding_model, get_embedding_model
 
 with open("pyproject.toml", "rb") as f:
     data = tomllib.load(f)
@@ -98,14 +101,49 @@ TOOL_ANNOTATIONS = {
         "destructiveHint": False,
         "openWorldHint": True,
     },
+    "recommend_points": {
+        "title": "Recommend Points",
+        "readOnlyHint": True,
+        "openWorldHint": True,
+    },
+    "discover_points": {
+        "title": "Discover Points",
+        "readOnlyHint": True,
+        "openWorldHint": True,
+    },
+    "search_point_groups": {
+        "title": "Search Point Groups",
+        "readOnlyHint": True,
+        "openWorldHint": True,
+    },
 }
 
-# Register all tools automatically with annotations
+# Register all tools automatically with annotations and per-tool deadlines
 for tool in TOOLS:
     tool_name = tool.__name__
     annotations = TOOL_ANNOTATIONS.get(tool_name, {})
-    mcp.tool(annotations=annotations)(tool)
+    mcp.tool(annotations=annotations)(with_deadline(tool))
+
+
+def create_app():
+    """ASGI app factory for multi-worker mode, called once in every uvicorn worker"""
+    # Every worker needs its own ONNX sessions, load them before it accepts requests
+    for model_name in settings.preload_embedding_models:
+        get_embedding_model(model_name)
+    return mcp.http_app(transport="streamable-http", stateless_http=True)
 
 
 if __name__ == "__main__":
-    mcp.run(transport="sse", host="0.0.0.0", port=8080)
+    if settings.workers > 1:
+        # Workers are spawned, not forked, so nothing loaded here is shared with them: only download the model
+        # files once, so workers don't race to download them into the shared model cache
+        for model_name in settings.preload_embedding_models:
+            download_embedding_model(model_name)
+
+        # Stateless streamable-http: any worker can serve any request, no session affinity needed
+        uvicorn.run("main:create_app", factory=True, host=settings.host, port=settings.port, workers=settings.workers)
+    else:
+        for model_name in settings.preload_embedding_models:
+            get_embedding_model(model_name)
+
+        mcp.run(transport=settings.transport, host=settings.host, port=settings.port)
@@ -0,0 +1,91 @@
+"""Embedding micro-benchmark: texts/sec for each combination of ONNX runtime options
+
+Run on the target hardware and copy the fastest configuration into the EMBEDDING_* settings
+(or EMBEDDING_MODEL_OPTIONS for a single model):
+
+    uv run python -m src.benchmark --threads 1 2 4 --batch-sizes 32 256 --quantized false true
+"""
+
+import argparse
+import itertools
+import os
+import time
+
+from src.settings import EmbeddingModelOptions
+from src.tools.points.common import build_embedding_model, resolve_model_name
+
+SAMPLE_TEXT = (
+    "Qdrant is a vector similarity search engine. It provides a production-ready service with a convenient API "
+    "to store, search, and manage points - vectors with an additional payload. "
+)
+
+
+def parse_bool(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def benchmark(model_name: str, options: EmbeddingModelOptions, texts: list[str], rounds: int) -> float:
+    """Embed the texts `rounds` times after one warm-up pass and return the best texts/sec"""
+    model = build_embedding_model(model_name, options)
+
+    def embed() -> None:
+        list(model.embed(texts, batch_size=options.batch_size, parallel=options.parallel))
+
+    embed()
+    best = 0.0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        embed()
+        best = max(best, len(texts) / (time.perf_counter() - start))
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="BAAI/bge-small-en-v1.5", help="fastembed model name")
+    parser.add_argument("--texts", type=int, default=512, help="number of texts per round")
+    parser.add_argument("--text-words", type=int, default=64, help="approximate words per text")
+    parser.add_argument("--rounds", type=int, default=3, help="timed rounds per configuration")
+    parser.add_argument("--threads", type=int, nargs="+", default=[0, os.cpu_count() or 1], help="0 = ORT default")
+    parser.add_argument("--parallel", type=int, nargs="+", default=[-1], help="-1 = in-process, 0 = all cores")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 256])
+    parser.add_argument("--max-lengths", type=int, nargs="+", default=[0], help="0 = model default")
+    parser.add_argument("--quantized", type=parse_bool, nargs="+", default=[False, True])
+    args = parser.parse_args()
+
+    words = SAMPLE_TEXT.split()
+    text = " ".join(itertools.islice(itertools.cycle(words), args.text_words))
+    texts = [f"{i} {text}" for i in range(args.texts)]
+
+    print(f"{'model':<40} {'threads':>7} {'parallel':>8} {'batch':>5} {'max_len':>7} {'texts/sec':>10}")
+    results = []
+    for threads, parallel, batch_size, max_length, quantized in itertools.product(
+        args.threads, args.parallel, args.batch_sizes, args.max_lengths, args.quantized
+    ):
+        try:
+            options = EmbeddingModelOptions(
+                threads=threads or None,
+                parallel=None if parallel < 0 else parallel,
+                batch_size=batch_size,
+                max_length=max_length or None,
+                quantized=quantized,
+            )
+        except ValueError:
+            # parallel workers ignore max_length, so the server rejects this combination too
+            continue
+        rate = benchmark(args.model, options, texts, args.rounds)
+        results.append((rate, options))
+        print(
+            f"{resolve_model_name(args.model, quantized):<40} {threads or 'auto':>7} "
+            f"{'off' if parallel < 0 else parallel:>8} {batch_size:>5} {max_length or 'auto':>7} {rate:>10.1f}"
+        )
+
+    if not results:
+        print("\nNo valid configuration in the grid")
+        return
+    rate, options = max(results, key=lambda result: result[0])
+    print(f"\nFastest ({rate:.1f} texts/sec): {options.model_dump_json(exclude_none=True)}")
+
+
+if __name__ == "__main__":
+    main()
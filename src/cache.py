@@ -0,0 +1,115 @@
+"""Embedding and metadata caches over a pluggable key-value backend
+
+The memory backend is local to one process. The disk backend is shared by all workers on a host
+and the redis backend by all instances of the server. The caches are best effort: a failing backend
+is logged and treated as a miss, never as a tool error.
+"""
+
+import hashlib
+
+import logfire
+from key_value.aio.protocols import AsyncKeyValue
+
+from src.settings import settings
+
+EMBEDDINGS_COLLECTION = "embeddings"
+METADATA_COLLECTION = "metadata"
+
+_store: AsyncKeyValue | None = None
+
+
+def get_cache_store() -> AsyncKeyValue:
+    """Get or create the cache store for the configured backend"""
+    global _store
+    if _store is None:
+        if settings.cache_backend == "disk":
+            from key_value.aio.stores.disk import DiskStore
+
+            _store = DiskStore(directory=settings.cache_url or ".cache/qdrant-admin-mcp")
+        elif settings.cache_backend == "redis":
+            from key_value.aio.stores.redis import RedisStore
+
+            _store = RedisStore(url=settings.cache_url or "redis://localhost:6379/0")
+        else:
+            from key_value.aio.stores.memory import MemoryStore
+
+            _store = MemoryStore(max_entries_per_collection=settings.cache_max_entries)
+    return _store
+
+
+def embedding_cache_enabled() -> bool:
+    """Whether embeddings are cached, by default only in the shared disk and redis backends"""
+    if settings.embedding_cache is None:
+        return settings.cache_backend != "memory"
+    return settings.embedding_cache
+
+
+def embedding_key(model_name: str, text: str) -> str:
+    """Cache key for the embedding of a text with a given model"""
+    return hashlib.sha256(f"{model_name}\0{text}".encode()).hexdigest()
+
+
+async def get_cached_embeddings(model_name: str, texts: list[str]) -> list[list[float] | None]:
+    """Look up cached embeddings, returning None for every text that is not cached"""
+    if not embedding_cache_enabled() or not texts:
+        return [None] * len(texts)
+
+    keys = [embedding_key(model_name, text) for text in texts]
+    try:
+        entries = await get_cache_store().get_many(keys, collection=EMBEDDINGS_COLLECTION)
+    except Exception:
+        logfire.warn("Embedding cache lookup failed", backend=settings.cache_backend, _exc_info=True)
+        return [None] * len(texts)
+    return [entry["vector"] if entry else None for entry in entries]
+
+
+async def put_cached_embeddings(model_name: str, texts: list[str], vectors: list[list[float]]) -> None:
+    """Store embeddings for texts"""
+    if not embedding_cache_enabled() or not texts:
+        return
+
+    try:
+        await get_cache_store().put_many(
+            [embedding_key(model_name, text) for text in texts],
+            [{"vector": vector} for vector in vectors],
+            collection=EMBEDDINGS_COLLECTION,
+            ttl=settings.embedding_cache_ttl,
+        )
+    except Exception:
+        logfire.warn("Embedding cache store failed", backend=settings.cache_backend, _exc_info=True)
+
+
+def collection_metadata_key(namespace: str, collection_name: str) -> str:
+    """Cache key for the info of a collection within a client's cache namespace"""
+    return f"{namespace}:collection:{collection_name}"
+
+
+async def get_cached_metadata(key: str) -> dict | None:
+    """Look up cached metadata, None if missing or the metadata cache is disabled"""
+    if settings.metadata_cache_ttl <= 0:
+        return None
+    try:
+        return await get_cache_store().get(key, collection=METADATA_COLLECTION)
+    except Exception:
+        logfire.warn("Metadata cache lookup failed", backend=settings.cache_backend, key=key, _exc_info=True)
+        return None
+
+
+async def put_cached_metadata(key: str, value: dict) -> None:
+    """Store metadata for the configured time to live"""
+    if settings.metadata_cache_ttl <= 0:
+        return
+    try:
+        await get_cache_store().put(key, value, collection=METADATA_COLLECTION, ttl=settings.metadata_cache_ttl)
+    except Exception:
+        logfire.warn("Metadata cache store failed", backend=settings.cache_backend, key=key, _exc_info=True)
+
+
+async def invalidate_metadata(key: str) -> None:
+    """Drop cached metadata after a change; if the backend fails, the entry expires with its time to live"""
+    if settings.metadata_cache_ttl <= 0:
+        return
+    try:
+        await get_cache_store().delete(key, collection=METADATA_COLLECTION)
+    except Exception:
+        logfire.warn("Metadata cache invalidation failed", backend=settings.cache_backend, key=key, _exc_info=True)
@@ -0,0 +1,350 @@
+"""Conformance suite: run every tool in src.tools.TOOLS against qdrant-client's embedded local mode
+
+Needs no Qdrant server and no network (tools that embed text are skipped unless the embedding model is
+already in the local model cache), so cache, batching and pooling changes can be checked anywhere:
+
+    uv run python -m src.conformance
+    uv run python -m src.conformance --url path:///tmp/qdrant-conformance
+
+The resilience cases then inject failures through fake client calls to check the retry, circuit-breaker and
+deadline policy, which the local backend never exercises.
+
+Exits non-zero if a tool or resilience case fails, or if a tool in TOOLS has no conformance case.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import sys
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any
+
+import httpx
+import numpy as np
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from src.settings import settings
+from src.tools import TOOLS
+from src.tools.collection.resilience import UpstreamPolicy, UpstreamUnavailableError, _deadline, with_deadline
+from src.tools.points.common import get_embedding_model
+
+COLLECTION = "conformance"
+GROUPS = 4
+POINTS = 40
+
+
+class Unsupported(Exception):
+    """The backend does not implement the operation (e.g. snapshots in local mode)"""
+
+
+class Skipped(Exception):
+    """A prerequisite of the case is unavailable (e.g. the embedding model cannot be loaded)"""
+
+
+def check(condition: bool, message: str) -> None:
+    if not condition:
+        raise AssertionError(message)
+
+
+class Suite:
+    """Conformance cases keyed by tool name, run in declaration order against one collection"""
+
+    def __init__(self, vector_size: int, embedding_available: bool):
+        self.vector_size = vector_size
+        self.embedding_available = embedding_available
+        self.tools = {tool.__name__: with_deadline(tool) for tool in TOOLS}
+        self.cases: dict[str, Callable[[], Awaitable[None]]] = {
+            "status": self.status,
+            "create_collection": self.create_collection,
+            "list_collections": self.list_collections,
+            "get_collection": self.get_collection,
+            "upsert_points": self.upsert_points,
+            "get_points": self.get_points,
+            "search_points": self.search_points,
+            "recommend_points": self.recommend_points,
+            "discover_points": self.discover_points,
+            "search_point_groups": self.search_point_groups,
+            "delete_points": self.delete_points,
+            "create_snapshot": self.create_snapshot,
+            "list_snapshots": self.list_snapshots,
+            "delete_snapshot": self.delete_snapshot,
+            "recover_from_snapshot": self.recover_from_snapshot,
+            "delete_collection": self.delete_collection,
+        }
+
+    async def call(self, tool_name: str, **kwargs: Any) -> Any:
+        try:
+            return await self.tools[tool_name](**kwargs)
+        except NotImplementedError as e:
+            raise Unsupported(str(e)) from e
+
+    def requires_embedding(self) -> None:
+        if not self.embedding_available:
+            raise Skipped("embedding model unavailable")
+
+    async def status(self) -> None:
+        result = await self.call("status")
+        check(result["status"] == "healthy", f"unhealthy: {result['error']}")
+
+    async def create_collection(self) -> None:
+        await self.call("create_collection", name=COLLECTION, vector_size=self.vector_size)
+
+    async def list_collections(self) -> None:
+        check(COLLECTION in await self.call("list_collections"), "created collection not listed")
+
+    async def get_collection(self) -> None:
+        result = await self.call("get_collection", name=COLLECTION)
+        check(result["vector_size"] == self.vector_size, f"unexpected vector size {result.get('vector_size')}")
+
+    async def upsert_points(self) -> None:
+        rng = np.random.default_rng(0)
+        points = [
+            {
+                "id": i,
+                "vector": rng.random(self.vector_size).tolist(),
+                "payload": {"group": i % GROUPS, "body": f"point {i} " * 20},
+            }
+            for i in range(POINTS)
+        ]
+        result = await self.call("upsert_points", collection_name=COLLECTION, points=points, skip_unchanged=True)
+        check(result["inserted"] == POINTS, f"expected {POINTS} inserts, got {result}")
+
+        result = await self.call("upsert_points", collection_name=COLLECTION, points=points, skip_unchanged=True)
+        check(result["skipped"] == POINTS, f"expected {POINTS} skipped, got {result}")
+
+    async def get_points(self) -> None:
+        result = await self.call(
+            "get_points", collection_name=COLLECTION, ids=[0, 1], with_vectors=False, max_text_length=5
+        )
+        check(sorted(point["id"] for point in result) == [0, 1], "wrong points returned")
+        check(all(len(point["payload"]["body"]) == 5 for point in result), "payload not truncated to 5 characters")
+
+    async def search_points(self) -> None:
+        self.requires_embedding()
+        result = await self.call(
+            "search_points", collection_name=COLLECTION, query_text="point", limit=5, dedupe_by="group", diversity=0.5
+        )
+        check(0 < len(result) <= GROUPS, f"expected at most one result per group, got {len(result)}")
+
+    async def recommend_points(self) -> None:
+        result = await self.call("recommend_points", collection_name=COLLECTION, positive=[0], negative=[1], limit=5)
+        check(len(result) == 5 and all(point["id"] not in (0, 1) for point in result), "bad recommendations")
+
+    async def discover_points(self) -> None:
+        result = await self.call(
+            "discover_points", collection_name=COLLECTION, context=[{"positive": 0, "negative": 1}], target=2, limit=5
+        )
+        check(len(result) == 5, f"expected 5 results, got {len(result)}")
+
+    async def search_point_groups(self) -> None:
+        result = await self.call(
+            "search_point_groups", collection_name=COLLECTION, group_by="group", positive=[0], limit=GROUPS
+        )
+        check(len(result) == GROUPS, f"expected {GROUPS} groups, got {len(result)}")
+
+    async def delete_points(self) -> None:
+        await self.call("delete_points", collection_name=COLLECTION, ids=[0])
+        check(await self.call("get_points", collection_name=COLLECTION, ids=[0]) == [], "point not deleted")
+
+    async def create_snapshot(self) -> None:
+        await self.call("create_snapshot", collection_name=COLLECTION)
+
+    async def list_snapshots(self) -> None:
+        check(isinstance(await self.call("list_snapshots", collection_name=COLLECTION), list), "not a list")
+
+    async def delete_snapshot(self) -> None:
+        result = await self.call("delete_snapshot", collection_name=COLLECTION, snapshot_name="missing")
+        check("not confirmed" in result, "deletion ran without confirmation")
+        await self.call("delete_snapshot", collection_name=COLLECTION, snapshot_name="missing", confirm=True)
+
+    async def recover_from_snapshot(self) -> None:
+        result = await self.call("recover_from_snapshot", collection_name=COLLECTION, snapshot_name="missing")
+        check("not confirmed" in result, "recovery ran without confirmation")
+        await self.call("recover_from_snapshot", collection_name=COLLECTION, snapshot_name="missing", confirm=True)
+
+    async def delete_collection(self) -> None:
+        await self.call("delete_collection", name=COLLECTION, confirm=True)
+        check(COLLECTION not in await self.call("list_collections"), "collection not deleted")
+
+
+@contextlib.contextmanager
+def override_settings(**values: Any) -> Iterator[None]:
+    """Temporarily replace settings, restoring them afterwards"""
+    previous = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(settings, name, value)
+
+
+class FakeCall:
+    """Stand-in for a client method that fails or stalls in a scripted way and counts its calls"""
+
+    def __init__(self, status_code: int | None = None, delay: float = 0.0):
+        self.status_code = status_code
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.status_code is not None:
+            raise UnexpectedResponse(self.status_code, "Injected", b"", httpx.Headers())
+        return "ok"
+
+
+class ResilienceSuite:
+    """Fault-injection cases for UpstreamPolicy and with_deadline, each against a fresh policy"""
+
+    def __init__(self) -> None:
+        self.cases: dict[str, Callable[[], Awaitable[None]]] = {
+            "retry_then_open_breaker": self.retry_then_open_breaker,
+            "client_error_not_counted": self.client_error_not_counted,
+            "write_timeout_not_replayed": self.write_timeout_not_replayed,
+            "deadline_relabelled": self.deadline_relabelled,
+        }
+
+    @staticmethod
+    def policy(name: str) -> UpstreamPolicy:
+        return UpstreamPolicy(f"fake://{name}")
+
+    async def retry_then_open_breaker(self) -> None:
+        with override_settings(qdrant_max_retries=2, qdrant_retry_backoff=0.0, circuit_breaker_failure_threshold=3):
+            policy = self.policy("retry")
+            fake = FakeCall(status_code=503)
+            with contextlib.suppress(UnexpectedResponse):
+                await policy.call("query_points", fake)
+            check(fake.calls == 3, f"expected 3 attempts on 503, got {fake.calls}")
+            check(policy.breaker.state == "open", f"breaker {policy.breaker.state} after 3 failures")
+
+            with contextlib.suppress(UpstreamUnavailableError):
+                await policy.call("query_points", fake)
+            check(fake.calls == 3, "open breaker let a call through")
+
+            fake = FakeCall(status_code=500)
+            policy = self.policy("non-retryable")
+            with contextlib.suppress(UnexpectedResponse):
+                await policy.call("query_points", fake)
+            check(fake.calls == 1 and policy.breaker.failures == 1, "500 retried or not counted")
+
+    async def client_error_not_counted(self) -> None:
+        with override_settings(qdrant_max_retries=2, qdrant_retry_backoff=0.0):
+            policy = self.policy("client-error")
+            fake = FakeCall(status_code=404)
+            with contextlib.suppress(UnexpectedResponse):
+                await policy.call("get_collection", fake)
+            check(fake.calls == 1, f"404 retried {fake.calls - 1} times")
+            check(policy.breaker.failures == 0, "404 counted toward the breaker")
+
+    async def write_timeout_not_replayed(self) -> None:
+        with override_settings(qdrant_max_retries=2, qdrant_retry_backoff=0.0, qdrant_attempt_timeout=0.05):
+            # Writes get no attempt timeout unless configured
+            fake = FakeCall(delay=0.1)
+            check(await self.policy("slow-write").call("upsert", fake) == "ok", "slow upsert failed")
+
+            with override_settings(qdrant_attempt_timeouts={"upsert": 0.05}):
+                fake = FakeCall(delay=1.0)
+                with contextlib.suppress(TimeoutError):
+                    await self.policy("write-timeout").call("upsert", fake)
+                check(fake.calls == 1, f"timed-out upsert replayed {fake.calls - 1} times")
+
+            fake = FakeCall(delay=1.0)
+            with contextlib.suppress(TimeoutError):
+                await self.policy("read-timeout").call("query_points", fake)
+            check(fake.calls == 3, f"expected 3 attempts on read timeouts, got {fake.calls}")
+
+    async def deadline_relabelled(self) -> None:
+        policy = self.policy("deadline")
+
+        async def stalled_tool() -> str:
+            return await policy.call("query_points", FakeCall(delay=1.0))
+
+        with override_settings(tool_deadlines={"stalled_tool": 0.1}, qdrant_attempt_timeout=10.0):
+            try:
+                await with_deadline(stalled_tool)()
+                raise AssertionError("stalled tool finished")
+            except TimeoutError as e:
+                check("did not finish within" in str(e), f"deadline not relabelled: {e!r}")
+            check(policy.breaker.failures == 0, "tool deadline counted as an upstream failure")
+
+            # Without the outer timeout racing it, the attempt timeout clamped to the deadline fires first
+            token = _deadline.set(time.monotonic() + 0.1)
+            try:
+                with contextlib.suppress(TimeoutError):
+                    await policy.call("query_points", FakeCall(delay=1.0))
+            finally:
+                _deadline.reset(token)
+            check(policy.breaker.failures == 0, "attempt clamped to the tool deadline counted as an upstream failure")
+
+        with override_settings(
+            tool_deadlines={"stalled_tool": 10.0}, qdrant_attempt_timeout=0.05, qdrant_max_retries=0
+        ):
+            try:
+                await with_deadline(stalled_tool)()
+                raise AssertionError("stalled tool finished")
+            except TimeoutError as e:
+                check("did not finish within" not in str(e), "attempt timeout relabelled as the tool deadline")
+
+
+async def run_cases(prefix: str, cases: dict[str, Callable[[], Awaitable[None]]]) -> bool:
+    """Run cases in order, print one report line per case and return whether none failed"""
+    ok = True
+    for name, case in cases.items():
+        start = time.perf_counter()
+        try:
+            await case()
+            outcome = "pass"
+        except Unsupported:
+            outcome = "unsupported"
+        except Skipped as e:
+            outcome = f"skipped ({e})"
+        except Exception as e:
+            outcome = f"FAIL   {type(e).__name__}: {e}"
+            ok = False
+        print(f"{prefix + name:<40} {outcome:<40} {(time.perf_counter() - start) * 1000:>8.1f} ms")
+    return ok
+
+
+async def run(url: str, embedding_model: str) -> bool:
+    """Run the tool cases against a local backend URL and the resilience cases, report and return if all passed"""
+    settings.qdrant_url = url
+
+    try:
+        model = get_embedding_model(embedding_model)
+        vector_size = len(next(iter(model.embed(["probe"]))))
+        embedding_available = True
+    except Exception:
+        vector_size = 384
+        embedding_available = False
+
+    suite = Suite(vector_size, embedding_available)
+    ok = True
+
+    missing = [name for name in suite.tools if name not in suite.cases]
+    for name in missing:
+        print(f"{name:<40} FAIL   no conformance case")
+        ok = False
+
+    ok = await run_cases("", suite.cases) and ok
+    ok = await run_cases("resilience: ", ResilienceSuite().cases) and ok
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="memory://conformance", help="memory:// or path://<dir> backend URL")
+    parser.add_argument("--embedding-model", default="BAAI/bge-small-en-v1.5", help="fastembed model name")
+    args = parser.parse_args()
+
+    if not args.url.startswith(("memory://", "path://")):
+        parser.error("the conformance suite only runs against local backends (memory:// or path://)")
+
+    sys.exit(0 if asyncio.run(run(args.url, args.embedding_model)) else 1)
+
+
+if __name__ == "__main__":
+    main()
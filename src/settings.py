@@ -1,7 +1,34 @@
-from pydantic import Field
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class EmbeddingModelOptions(BaseModel):
+    """ONNX runtime and inference options for a single embedding model; unset fields use the global defaults"""
+
+    threads: int | None = Field(None, description="ONNX session threads (intra- and inter-op)", ge=1)
+    parallel: int | None = Field(
+        None,
+        description="Data-parallel worker processes, 0 uses all cores; a new process pool is started for every "
+        "embed call larger than batch_size",
+        ge=0,
+    )
+    batch_size: int | None = Field(None, description="Texts per ONNX inference batch", ge=1)
+    max_length: int | None = Field(
+        None, description="Maximum sequence length in tokens, capped at the model's own limit", ge=1
+    )
+    quantized: bool | None = Field(None, description="Use the quantized (int8) variant of the model if available")
+
+    @model_validator(mode="after")
+    def check_parallel_max_length(self) -> "EmbeddingModelOptions":
+        # fastembed's parallel workers load their own tokenizer, so the truncation would only apply to
+        # small batches and the same text would embed differently depending on batch size
+        if self.parallel is not None and self.max_length is not None:
+            raise ValueError("max_length cannot be combined with parallel, worker processes ignore it")
+        return self
+
+
 class Settings(BaseSettings):
     logfire_token: str | None = Field(
         None,
@@ -17,6 +44,204 @@ class Settings(BaseSettings):
         description="Project name",
     )
 
+    qdrant_url: str = Field(
+        "http://localhost:6333",
+        description="Qdrant URL used when a request has no x-qdrant-url header; memory:// or path://<dir> "
+        "selects qdrant-client's embedded local mode",
+    )
+    allow_local_backends: bool = Field(
+        False,
+        description="Allow memory:// and path:// URLs in the x-qdrant-url request header",
+    )
+    qdrant_attempt_timeout: float = Field(
+        10.0,
+        description="Timeout in seconds for a single attempt of a retryable read from Qdrant",
+    )
+    qdrant_attempt_timeouts: dict[str, float] = Field(
+        {},
+        description="Per-operation attempt timeouts in seconds, keyed by client method (e.g. query_points); "
+        "writes (upsert, delete) have none unless set here",
+    )
+    qdrant_max_retries: int = Field(
+        2,
+        description="Maximum number of retries for idempotent Qdrant calls",
+        ge=0,
+    )
+    qdrant_retry_backoff: float = Field(
+        0.2,
+        description="Base delay in seconds for jittered exponential retry backoff",
+    )
+    qdrant_retry_backoff_max: float = Field(
+        2.0,
+        description="Upper bound in seconds for a single retry backoff",
+    )
+    qdrant_max_concurrency: int = Field(
+        16,
+        description="Maximum number of in-flight calls per Qdrant URL",
+        ge=1,
+    )
+    qdrant_queue_timeout: float = Field(
+        5.0,
+        description="Seconds to wait for a free concurrency slot before failing fast",
+    )
+    circuit_breaker_failure_threshold: int = Field(
+        5,
+        description="Consecutive upstream failures that open the circuit breaker for a Qdrant URL",
+        ge=1,
+    )
+    circuit_breaker_reset_timeout: float = Field(
+        30.0,
+        description="Seconds an open circuit breaker waits before letting a probe call through",
+    )
+    tool_deadline: float = Field(
+        60.0,
+        description="Default deadline in seconds for a whole tool call, including retries",
+    )
+    tool_deadlines: dict[str, float] = Field(
+        {
+            "create_snapshot": 600.0,
+            "recover_from_snapshot": 600.0,
+            "upsert_points": 300.0,
+        },
+        description="Per-tool deadline overrides in seconds, keyed by tool name",
+    )
+
+    transport: Literal["sse", "streamable-http"] = Field(
+        "sse",
+        description="MCP transport to serve; streamable-http is required for more than one worker",
+    )
+    host: str = Field(
+        "0.0.0.0",
+        description="Host interface to bind the server to",
+    )
+    port: int = Field(
+        8080,
+        description="Port to bind the server to",
+    )
+    workers: int = Field(
+        1,
+        description="Number of worker processes; more than one runs stateless streamable-http under uvicorn",
+        ge=1,
+    )
+
+    cache_backend: Literal["memory", "disk", "redis"] = Field(
+        "memory",
+        description="Backend for embedding and metadata caches; disk and redis are shared between workers",
+    )
+    cache_url: str | None = Field(
+        None,
+        description="Directory for the disk cache backend or URL for the redis cache backend",
+    )
+    cache_max_entries: int = Field(
+        10_000,
+        description="Maximum number of entries per cache for the in-process memory backend",
+        ge=1,
+    )
+    embedding_cache: bool | None = Field(
+        None,
+        description="Cache query embeddings keyed by model and text; if unset, only with the disk and redis backends, "
+        "as the memory backend keeps a copy in every worker",
+    )
+    embedding_cache_ttl: float | None = Field(
+        None,
+        description="Time to live in seconds for cached embeddings, no expiry if unset",
+    )
+    metadata_cache_ttl: float = Field(
+        0.0,
+        description="Time to live in seconds for cached collection info, disabled when 0",
+    )
+    embedding_model_cache_dir: str | None = Field(
+        None,
+        description="Directory for downloaded embedding model files, shared by all workers",
+    )
+    embedding_threads: int | None = Field(
+        None,
+        description="ONNX session threads for embedding models (intra- and inter-op), onnxruntime default if unset",
+        ge=1,
+    )
+    embedding_parallel: int | None = Field(
+        None,
+        description="Data-parallel embedding worker processes, 0 uses all cores; fastembed starts a new process "
+        "pool for every embed call larger than the batch size, so this only pays off for large upserts",
+        ge=0,
+    )
+    embedding_batch_size: int = Field(
+        256,
+        description="Texts per ONNX inference batch",
+        ge=1,
+    )
+    embedding_max_length: int | None = Field(
+        None,
+        description="Maximum sequence length in tokens, lowers but never raises the model's own limit",
+        ge=1,
+    )
+    embedding_quantized: bool = Field(
+        False,
+        description="Use quantized (int8) model variants where fastembed provides one",
+    )
+    embedding_model_options: dict[str, EmbeddingModelOptions] = Field(
+        {},
+        description="Per-model overrides of the embedding options, keyed by model name",
+    )
+    preload_embedding_models: list[str] = Field(
+        [],
+        description="Embedding models to download and load before serving requests",
+    )
+
+    trace_sample_rate: float = Field(
+        1.0,
+        description="Fraction of tool calls that are traced",
+        ge=0.0,
+        le=1.0,
+    )
+    trace_sample_rates: dict[str, Annotated[float, Field(ge=0.0, le=1.0)]] = Field(
+        {},
+        description="Per-tool overrides of the trace sample rate, keyed by tool name",
+    )
+    trace_disabled_tools: list[str] = Field(
+        [],
+        description="Tools that are never traced",
+    )
+    trace_summarize: bool = Field(
+        False,
+        description="Record lists and dicts in span attributes as a count and hash instead of their contents",
+    )
+    trace_max_items: int = Field(
+        20,
+        description="Maximum number of items of a list or dict kept in a span attribute",
+        ge=0,
+    )
+    trace_max_length: int = Field(
+        256,
+        description="Maximum length of a string kept in a span attribute",
+        ge=0,
+    )
+
+    @model_validator(mode="after")
+    def check_workers_transport(self) -> "Settings":
+        if self.workers > 1 and self.transport == "sse":
+            raise ValueError("SSE sessions are bound to one process, use transport=streamable-http with workers > 1")
+        return self
+
+    @model_validator(mode="after")
+    def check_embedding_options(self) -> "Settings":
+        # Resolve the global defaults and every per-model override once, so invalid combinations fail at startup
+        for model_name in ["", *self.embedding_model_options]:
+            self.get_embedding_options(model_name)
+        return self
+
+    def get_embedding_options(self, model_name: str) -> EmbeddingModelOptions:
+        """Resolve the effective embedding options for a model from its overrides and the global defaults"""
+        overrides = self.embedding_model_options.get(model_name, EmbeddingModelOptions())
+        defaults = {
+            "threads": self.embedding_threads,
+            "parallel": self.embedding_parallel,
+            "batch_size": self.embedding_batch_size,
+            "max_length": self.embedding_max_length,
+            "quantized": self.embedding_quantized,
+        }
+        return EmbeddingModelOptions(**{**defaults, **overrides.model_dump(exclude_unset=True)})
+
     model_config = SettingsConfigDict(
         extra="ignore",
         case_sensitive=False,
@@ -0,0 +1,120 @@
+"""Low-overhead tracing for tools: per-tool sampling, attribute size caps and summarized attributes
+
+Each tool opens its outermost span with `tool_span`, which makes one sampling decision per call. Nested
+`child_span` calls follow that decision, so an unsampled call creates no spans and serializes no attributes
+unless it fails: failures of sampled-out calls are still recorded, those of disabled tools are not.
+"""
+
+import contextlib
+import contextvars
+import hashlib
+import random
+from collections.abc import Iterator
+from typing import Any
+
+import logfire
+
+from src.settings import settings
+
+# Sampling decision of the tool call in progress, None outside of a tool
+_sampled: contextvars.ContextVar[bool | None] = contextvars.ContextVar("trace_sampled", default=None)
+
+
+class NoopSpan:
+    """Stand-in for an unsampled span; setting attributes costs nothing"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        pass
+
+
+class ShapedSpan:
+    """Span wrapper that caps or summarizes attributes before they are serialized"""
+
+    def __init__(self, span: logfire.LogfireSpan):
+        self._span = span
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self._span.set_attributes(shape_attributes({key: value}))
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        self._span.set_attributes(shape_attributes(attributes))
+
+
+def sample_rate(tool_name: str) -> float:
+    """Effective sampling rate of a tool, 0 when tracing is disabled for it"""
+    if tool_name in settings.trace_disabled_tools:
+        return 0.0
+    return settings.trace_sample_rates.get(tool_name, settings.trace_sample_rate)
+
+
+def shape_attributes(attributes: dict[str, Any]) -> dict[str, Any]:
+    """Apply attribute size caps, or replace collections by count and hash in summarized mode
+
+    Keys starting with an underscore are logfire span options (e.g. `_level`) and pass through untouched.
+    """
+    shaped = {}
+    for key, value in attributes.items():
+        if key.startswith("_"):
+            shaped[key] = value
+        elif isinstance(value, (list, tuple, set, dict)):
+            if settings.trace_summarize:
+                shaped[f"{key}_count"] = len(value)
+                shaped[f"{key}_hash"] = hashlib.sha1(repr(value).encode()).hexdigest()[:12]
+            elif len(value) > settings.trace_max_items:
+                items = list(value.items() if isinstance(value, dict) else value)[: settings.trace_max_items]
+                shaped[key] = _cap(dict(items) if isinstance(value, dict) else items)
+                shaped[f"{key}_count"] = len(value)
+            else:
+                shaped[key] = _cap(value)
+        else:
+            shaped[key] = _cap(value)
+    return shaped
+
+
+def _cap(value: Any) -> Any:
+    if isinstance(value, str):
+        return value if len(value) <= settings.trace_max_length else value[: settings.trace_max_length] + "…"
+    if isinstance(value, (list, tuple, set)):
+        return [_cap(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _cap(item) for key, item in value.items()}
+    return value
+
+
+@contextlib.contextmanager
+def tool_span(tool_name: str, msg_template: str, **attributes: Any) -> Iterator[ShapedSpan | NoopSpan]:
+    """Open the outermost span of a tool call, sampled at the tool's configured rate
+
+    A sampled-out call that raises still gets its span, opened as the exception propagates so that it records
+    the error; only its duration and nested spans are missing. Tools in trace_disabled_tools emit nothing.
+    """
+    rate = sample_rate(tool_name)
+    sampled = rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+    token = _sampled.set(sampled)
+    try:
+        if not sampled:
+            try:
+                yield NoopSpan()
+            except Exception:
+                if tool_name in settings.trace_disabled_tools:
+                    raise
+                with logfire.span(msg_template, tool=tool_name, sampled=False, **shape_attributes(attributes)):
+                    raise
+            return
+        with logfire.span(msg_template, tool=tool_name, **shape_attributes(attributes)) as span:
+            yield ShapedSpan(span)
+    finally:
+        _sampled.reset(token)
+
+
+@contextlib.contextmanager
+def child_span(msg_template: str, **attributes: Any) -> Iterator[ShapedSpan | NoopSpan]:
+    """Open a nested span that follows the sampling decision of the enclosing tool call"""
+    if _sampled.get() is False:
+        yield NoopSpan()
+        return
+    with logfire.span(msg_template, **shape_attributes(attributes)) as nested:
+        yield ShapedSpan(nested)
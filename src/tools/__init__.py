@@ -18,6 +18,9 @@ from src.tools.points import (
     delete_points,
     search_points,
     upsert_points,
+    recommend_points,
+    discover_points,
+    search_point_groups,
 )
 from src.tools.status import status
 
@@ -40,4 +43,7 @@ TOOLS = [
     delete_points,
     search_points,
     upsert_points,
+    recommend_points,
+    discover_points,
+    search_point_groups,
 ]
@@ -1,17 +1,41 @@
 """Helper to get Qdrant client instance"""
 
+import hashlib
+
 from fastmcp.server.dependencies import get_http_request
 from qdrant_client import AsyncQdrantClient
 
+from src.settings import settings
+from src.tools.collection.resilience import ResilientQdrantClient, get_upstream_policy
+
+# URL schemes served by qdrant-client's embedded local mode instead of a remote Qdrant
+LOCAL_SCHEMES = ("memory://", "path://")
+
 # Cache of (client, api_key) keyed by URL
 # strict requirement: use URL as cache key
 _clients: dict[str, tuple[AsyncQdrantClient, str | None]] = {}
 
 
-async def get_qdrant_client() -> AsyncQdrantClient:
-    """Get or create async Qdrant client instance based on request headers"""
+def create_client(url: str, api_key: str | None) -> AsyncQdrantClient:
+    """Create a client for a remote URL, or a local one for memory:// and path:// URLs
+
+    Every distinct memory:// URL (e.g. memory://tests) is its own in-memory database for the lifetime of the
+    process; path://<dir> persists to a local directory.
+    """
+    if url.startswith("memory://"):
+        return AsyncQdrantClient(location=":memory:")
+    if url.startswith("path://"):
+        return AsyncQdrantClient(path=url.removeprefix("path://"))
+    return AsyncQdrantClient(url=url, api_key=api_key)
+
+
+async def get_qdrant_client() -> ResilientQdrantClient:
+    """Get or create async Qdrant client instance based on request headers
+
+    The pooled client is wrapped in the shared retry, deadline and circuit-breaker policy for its URL.
+    """
     # Default values
-    url = "http://localhost:6333"
+    url = settings.qdrant_url
     api_key = None
 
     try:
@@ -28,6 +52,13 @@ async def get_qdrant_client() -> AsyncQdrantClient:
         # Fallback for non-request context (e.g. startup checks)
         pass
 
+    if url.startswith(LOCAL_SCHEMES):
+        if url != settings.qdrant_url and not settings.allow_local_backends:
+            # Never let a request header point the server at its own memory or filesystem
+            raise ValueError("Local Qdrant backends (memory://, path://) are disabled for request headers")
+        # Local mode has no authentication, and recreating the client would drop an in-memory database
+        api_key = None
+
     # Logic: Use URL as cache key
     # If the API key for that URL changes, we must recreate the client
     global _clients
@@ -37,10 +68,13 @@ async def get_qdrant_client() -> AsyncQdrantClient:
         if cached_key != api_key:
             # API Key changed for this URL, recreate client
             await client.close()
-            client = AsyncQdrantClient(url=url, api_key=api_key)
+            client = create_client(url, api_key)
             _clients[url] = (client, api_key)
     else:
-        client = AsyncQdrantClient(url=url, api_key=api_key)
+        client = create_client(url, api_key)
         _clients[url] = (client, api_key)
 
-    return _clients[url][0]
+    # Scope shared cache entries to the credentials, so tenants of one URL never read each other's entries
+    cache_namespace = hashlib.sha256(f"{url}\0{api_key or ''}".encode()).hexdigest()[:16]
+
+    return ResilientQdrantClient(_clients[url][0], get_upstream_policy(url), cache_namespace, api_key)
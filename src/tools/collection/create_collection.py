@@ -2,10 +2,11 @@
 
 from typing import Annotated, Literal
 
-import logfire
 from pydantic import Field
 from qdrant_client import models
 
+from src.cache import collection_metadata_key, invalidate_metadata
+from src.telemetry import tool_span
 from src.tools.collection.client import get_qdrant_client
 
 
@@ -30,7 +31,7 @@ async def create_collection(
     Returns:
         Success message with collection details
     """
-    with logfire.span("Create Qdrant collection") as span:
+    with tool_span("create_collection", "Create Qdrant collection") as span:
         client = await get_qdrant_client()
 
         # Map string distance to Qdrant Distance enum
@@ -45,6 +46,7 @@ async def create_collection(
             collection_name=name,
             vectors_config=models.VectorParams(size=vector_size, distance=distance_map[distance]),
         )
+        await invalidate_metadata(collection_metadata_key(client.cache_namespace, name))
 
         span.set_attribute("collection_name", name)
         span.set_attribute("vector_size", vector_size)
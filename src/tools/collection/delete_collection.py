@@ -5,6 +5,8 @@ from typing import Annotated
 import logfire
 from pydantic import Field
 
+from src.cache import collection_metadata_key, invalidate_metadata
+from src.telemetry import tool_span
 from src.tools.collection.client import get_qdrant_client
 
 
@@ -29,7 +31,7 @@ async def delete_collection(
     Returns:
         Success message if deleted, or error if not confirmed
     """
-    with logfire.span("Delete Qdrant collection", _level="warn") as span:
+    with tool_span("delete_collection", "Delete Qdrant collection", _level="warn") as span:
         if not confirm:
             span.set_attribute("confirmed", False)
             span.set_attribute("collection_name", name)
@@ -42,6 +44,7 @@ async def delete_collection(
         client = await get_qdrant_client()
 
         await client.delete_collection(collection_name=name)
+        await invalidate_metadata(collection_metadata_key(client.cache_namespace, name))
 
         span.set_attribute("confirmed", True)
         span.set_attribute("collection_name", name)
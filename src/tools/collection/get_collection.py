@@ -1,4 +1,5 @@
-import logfire
+from src.cache import collection_metadata_key, get_cached_metadata, put_cached_metadata
+from src.telemetry import tool_span
 from src.tools.collection.client import get_qdrant_client
 
 
@@ -11,8 +12,14 @@ async def get_collection(name: str) -> dict:
     Returns:
         Collection details including vector configuration, points count, and status
     """
-    with logfire.span("Get Qdrant collection info", collection_name=name) as span:
+    with tool_span("get_collection", "Get Qdrant collection info", collection_name=name) as span:
         client = await get_qdrant_client()
+        cache_key = collection_metadata_key(client.cache_namespace, name)
+        cached = await get_cached_metadata(cache_key)
+        if cached is not None:
+            span.set_attribute("cache_hit", True)
+            return cached
+
         collection_info = await client.get_collection(collection_name=name)
         
         vectors_config = collection_info.config.params.vectors
@@ -33,4 +40,5 @@ async def get_collection(name: str) -> dict:
             result["vectors_config"] = str(vectors_config)
 
         span.set_attributes(result)
+        await put_cached_metadata(cache_key, result)
         return result
@@ -1,5 +1,5 @@
 """List all collections in Qdrant"""
-import logfire
+from src.telemetry import tool_span
 from src.tools.collection.client import get_qdrant_client
 
 
@@ -9,7 +9,7 @@ async def list_collections() -> list[str]:
     Returns:
         List of collection names
     """
-    with logfire.span("List Qdrant collections") as span:
+    with tool_span("list_collections", "List Qdrant collections") as span:
         client = await get_qdrant_client()
         
         collections = await client.get_collections()
@@ -0,0 +1,324 @@
+"""Retry, deadline, circuit-breaker and concurrency policy for Qdrant calls"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+import httpx
+import logfire
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+from src.settings import settings
+
+T = TypeVar("T")
+
+# Client methods that can be safely retried. Upsert and delete are included because every
+# tool addresses points by explicit ID, so replaying them produces the same end state. Writes
+# are still never retried after a timeout, see WRITE_OPERATIONS.
+IDEMPOTENT_OPERATIONS = frozenset(
+    {
+        "collection_exists",
+        "count",
+        "delete",
+        "get_collection",
+        "get_collections",
+        "list_snapshots",
+        "query_batch_points",
+        "query_points",
+        "query_points_groups",
+        "retrieve",
+        "scroll",
+        "upsert",
+    }
+)
+
+# Writes among the idempotent operations. They get no per-attempt timeout (a slow write is bounded
+# by the tool deadline only) and are not retried after a timeout, as Qdrant may still be applying
+# them and a replay would add load exactly when the instance is overloaded.
+WRITE_OPERATIONS = frozenset({"delete", "upsert"})
+
+# HTTP statuses that indicate a transient upstream problem
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# Absolute monotonic deadline of the currently running tool, if any
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("qdrant_tool_deadline", default=None)
+
+
+class UpstreamUnavailableError(RuntimeError):
+    """Raised when a call is rejected without reaching Qdrant (open circuit or overload)"""
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Whether an error means Qdrant is unhealthy: any 5xx, 429, transport error or timeout
+
+    These count toward the circuit breaker; client errors such as a missing collection do not.
+    """
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code is not None and (error.status_code == 429 or error.status_code >= 500)
+    return isinstance(error, (ResponseHandlingException, httpx.TransportError, TimeoutError))
+
+
+def is_retryable(error: BaseException, operation: str) -> bool:
+    """Whether an upstream failure of an operation is transient and safe to retry"""
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    if operation in WRITE_OPERATIONS and _is_timeout(error):
+        return False
+    return is_upstream_failure(error)
+
+
+def _is_timeout(error: BaseException) -> bool:
+    if isinstance(error, ResponseHandlingException):
+        return isinstance(error.source, httpx.TimeoutException)
+    return isinstance(error, (TimeoutError, httpx.TimeoutException))
+
+
+def attempt_timeout(operation: str) -> float | None:
+    """Per-attempt timeout of an operation, None for non-retried calls and writes unless configured"""
+    if operation in settings.qdrant_attempt_timeouts:
+        return settings.qdrant_attempt_timeouts[operation]
+    if operation not in IDEMPOTENT_OPERATIONS or operation in WRITE_OPERATIONS:
+        return None
+    return settings.qdrant_attempt_timeout
+
+
+class CircuitBreaker:
+    """Per-URL circuit breaker: closed -> open after consecutive failures -> half-open probe"""
+
+    def __init__(self, url: str, failure_threshold: int, reset_timeout: float):
+        self.url = url
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Whether a call may proceed; moves an expired open circuit to half-open"""
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self._transition("half_open")
+        if self.state == "half_open":
+            # Only a single probe call is let through while half-open
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probing = False
+        if self.state != "closed":
+            self._transition("closed")
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            if self.state != "open":
+                self._transition("open")
+
+    def release(self) -> None:
+        """Release a half-open probe slot without recording an outcome (e.g. a 4xx response)"""
+        self._probing = False
+
+    def _transition(self, state: str) -> None:
+        previous, self.state = self.state, state
+        log = logfire.warn if state == "open" else logfire.info
+        log(
+            "Qdrant circuit breaker {previous} -> {state}",
+            previous=previous,
+            state=state,
+            qdrant_url=self.url,
+            failures=self.failures,
+        )
+
+
+class UpstreamPolicy:
+    """Shared resilience state for a single Qdrant URL"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.breaker = CircuitBreaker(
+            url,
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            reset_timeout=settings.circuit_breaker_reset_timeout,
+        )
+        self.max_concurrency = settings.qdrant_max_concurrency
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+
+    def state(self) -> dict[str, Any]:
+        return {
+            "circuit_state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+        }
+
+    async def call(self, operation: str, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Run a client call under the concurrency limit, circuit breaker, deadline and retry policy"""
+        retries = settings.qdrant_max_retries if operation in IDEMPOTENT_OPERATIONS else 0
+
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=_bounded(settings.qdrant_queue_timeout))
+        except TimeoutError:
+            logfire.warn("Qdrant concurrency limit reached", qdrant_url=self.url, operation=operation)
+            raise UpstreamUnavailableError(
+                f"Too many concurrent requests to Qdrant at {self.url}, try again later"
+            ) from None
+
+        self.in_flight += 1
+        try:
+            attempt = 0
+            while True:
+                if not self.breaker.allow():
+                    raise UpstreamUnavailableError(
+                        f"Circuit breaker for Qdrant at {self.url} is open, failing fast"
+                    )
+                timeout = attempt_timeout(operation)
+                bounded = _bounded(timeout)
+                # The tool deadline, not Qdrant, decides this attempt's timeout
+                clamped = bounded is not None and (timeout is None or bounded < timeout)
+                try:
+                    async with asyncio.timeout(bounded) as attempt_cm:
+                        result = await func(*args, **kwargs)
+                except Exception as e:
+                    if (clamped and attempt_cm.expired()) or not is_upstream_failure(e):
+                        self.breaker.release()
+                        raise
+                    self.breaker.record_failure()
+
+                    delay = _backoff(attempt)
+                    remaining = _remaining()
+                    out_of_time = remaining is not None and remaining <= delay
+                    give_up = attempt >= retries or out_of_time or self.breaker.state == "open"
+                    if give_up or not is_retryable(e, operation):
+                        raise
+                    attempt += 1
+                    logfire.warn(
+                        "Retrying Qdrant {operation} after {error}",
+                        operation=operation,
+                        error=type(e).__name__,
+                        attempt=attempt,
+                        delay_s=round(delay, 3),
+                        qdrant_url=self.url,
+                    )
+                    await asyncio.sleep(delay)
+                except BaseException:
+                    # Cancelled mid-call: free a half-open probe slot so the breaker can recover
+                    self.breaker.release()
+                    raise
+                else:
+                    self.breaker.record_success()
+                    return result
+        finally:
+            self.in_flight -= 1
+            self.semaphore.release()
+
+
+class ResilientQdrantClient:
+    """Proxy around AsyncQdrantClient that routes every async call through an UpstreamPolicy"""
+
+    def __init__(
+        self,
+        client: AsyncQdrantClient,
+        policy: UpstreamPolicy,
+        cache_namespace: str = "",
+        api_key: str | None = None,
+    ):
+        self._client = client
+        self._policy = policy
+        self._cache_namespace = cache_namespace
+        self._api_key = api_key
+
+    @property
+    def policy(self) -> UpstreamPolicy:
+        return self._policy
+
+    @property
+    def api_key(self) -> str | None:
+        """API key the client authenticates with, for calls where Qdrant has to authenticate against itself"""
+        return self._api_key
+
+    @property
+    def cache_namespace(self) -> str:
+        """Opaque key prefix scoping shared cache entries to one URL and API key"""
+        return self._cache_namespace
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self._policy.call(name, attr, *args, **kwargs)
+
+        return call
+
+
+# Policy state keyed by URL, shared by every client for that URL
+_policies: dict[str, UpstreamPolicy] = {}
+
+
+def get_upstream_policy(url: str) -> UpstreamPolicy:
+    """Get or create the shared resilience policy for a Qdrant URL"""
+    if url not in _policies:
+        _policies[url] = UpstreamPolicy(url)
+    return _policies[url]
+
+
+def with_deadline(tool: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """Bound a tool's total run time, including retries, by its configured deadline"""
+    tool_name = tool.__name__
+    deadline = settings.tool_deadlines.get(tool_name, settings.tool_deadline)
+
+    @functools.wraps(tool)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        token = _deadline.set(time.monotonic() + deadline)
+        try:
+            async with asyncio.timeout(deadline) as deadline_cm:
+                return await tool(*args, **kwargs)
+        except TimeoutError:
+            if not deadline_cm.expired():
+                # Raised inside the tool, e.g. a Qdrant attempt timeout; keep the real cause
+                raise
+            logfire.warn("Tool {tool} exceeded its deadline", tool=tool_name, deadline_s=deadline)
+            raise TimeoutError(f"Tool '{tool_name}' did not finish within {deadline}s") from None
+        finally:
+            _deadline.reset(token)
+
+    return wrapper
+
+
+def _remaining() -> float | None:
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def _bounded(timeout: float | None) -> float | None:
+    """Clamp a timeout to whatever is left of the current tool deadline"""
+    remaining = _remaining()
+    if remaining is None:
+        return timeout
+    if timeout is None:
+        return remaining
+    return min(timeout, remaining)
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with full jitter"""
+    cap = min(settings.qdrant_retry_backoff_max, settings.qdrant_retry_backoff * 2**attempt)
+    return random.uniform(0, cap)
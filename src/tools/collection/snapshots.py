@@ -3,6 +3,8 @@
 from typing import Annotated
 import logfire
 from pydantic import Field
+from src.cache import collection_metadata_key, invalidate_metadata
+from src.telemetry import tool_span
 from src.tools.collection.client import get_qdrant_client
 
 
@@ -20,7 +22,7 @@ async def create_snapshot(
     Returns:
         Success message with snapshot name
     """
-    with logfire.span("Create collection snapshot") as span:
+    with tool_span("create_snapshot", "Create collection snapshot") as span:
         client = await get_qdrant_client()
 
         result = await client.create_snapshot(collection_name=collection_name)
@@ -43,7 +45,7 @@ async def list_snapshots(
     Returns:
         list of snapshot names
     """
-    with logfire.span("List collection snapshots") as span:
+    with tool_span("list_snapshots", "List collection snapshots") as span:
         client = await get_qdrant_client()
 
         snapshots = await client.list_snapshots(collection_name=collection_name)
@@ -76,7 +78,7 @@ async def delete_snapshot(
     Returns:
         Success message if deleted, or error if not confirmed
     """
-    with logfire.span("Delete collection snapshot", _level="warn") as span:
+    with tool_span("delete_snapshot", "Delete collection snapshot", _level="warn") as span:
         if not confirm:
             span.set_attribute("confirmed", False)
             span.set_attribute("collection_name", collection_name)
@@ -122,7 +124,7 @@ async def recover_from_snapshot(
     Returns:
         Success message if recovered, or error if not confirmed
     """
-    with logfire.span("Recover collection from snapshot", _level="warn") as span:
+    with tool_span("recover_from_snapshot", "Recover collection from snapshot", _level="warn") as span:
         if not confirm:
             span.set_attribute("confirmed", False)
             span.set_attribute("collection_name", collection_name)
@@ -137,7 +139,11 @@ async def recover_from_snapshot(
 
         client = await get_qdrant_client()
 
-        await client.recover_snapshot(collection_name=collection_name, snapshot_name=snapshot_name)
+        # Qdrant recovers from a location it can fetch: the snapshot as served by the same instance, which
+        # needs the caller's API key when the instance is protected
+        location = f"{client.policy.url.rstrip('/')}/collections/{collection_name}/snapshots/{snapshot_name}"
+        await client.recover_snapshot(collection_name=collection_name, location=location, api_key=client.api_key)
+        await invalidate_metadata(collection_metadata_key(client.cache_namespace, collection_name))
 
         span.set_attribute("confirmed", True)
         span.set_attribute("collection_name", collection_name)
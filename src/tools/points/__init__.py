@@ -2,10 +2,14 @@ from src.tools.points.get_points import get_points
 from src.tools.points.delete_points import delete_points
 from src.tools.points.search_points import search_points
 from src.tools.points.upsert_points import upsert_points
+from src.tools.points.query_points import recommend_points, discover_points, search_point_groups
 
 __all__ = [
     "get_points",
     "delete_points",
     "search_points",
     "upsert_points",
+    "recommend_points",
+    "discover_points",
+    "search_point_groups",
 ]
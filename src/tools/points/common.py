@@ -1,8 +1,73 @@
+import asyncio
+import functools
+
+import logfire
 from fastembed import TextEmbedding
+from fastembed.common.utils import define_cache_dir
+
+from src.cache import get_cached_embeddings, put_cached_embeddings
+from src.settings import EmbeddingModelOptions, settings
 
 _embedding_models: dict[str, TextEmbedding] = {}
 
 
+@functools.cache
+def resolve_model_name(model_name: str, quantized: bool) -> str:
+    """Map a model name to its quantized (int8) fastembed variant when one is requested and available
+
+    Args:
+        model_name: Name of the fastembed model
+        quantized: Whether the quantized variant is wanted
+
+    Returns:
+        Name of the model to load
+    """
+    if not quantized:
+        return model_name
+
+    supported = {model["model"]: model for model in TextEmbedding.list_supported_models()}
+    if f"{model_name}-Q" in supported:
+        return f"{model_name}-Q"
+
+    description = supported.get(model_name, {})
+    source = (description.get("sources") or {}).get("hf") or ""
+    if not source.lower().endswith("-q"):
+        logfire.warn("No quantized variant of embedding model {model_name}, using it as is", model_name=model_name)
+    return model_name
+
+
+def build_embedding_model(model_name: str, options: EmbeddingModelOptions) -> TextEmbedding:
+    """Create an embedding model configured with the given ONNX runtime options
+
+    Args:
+        model_name: Name of the fastembed model to use
+        options: Effective embedding options for the model
+
+    Returns:
+        TextEmbedding instance
+    """
+    model = TextEmbedding(
+        model_name=resolve_model_name(model_name, bool(options.quantized)),
+        cache_dir=settings.embedding_model_cache_dir,
+        threads=options.threads,
+    )
+    if options.max_length is not None:
+        # Shorter sequences trade recall on long texts for much cheaper attention. The tokenizer already truncates
+        # to the model's context limit, and longer sequences would overflow its position embeddings.
+        tokenizer = model.model.tokenizer
+        limit = (tokenizer.truncation or {}).get("max_length")
+        if limit is not None and options.max_length > limit:
+            logfire.warn(
+                "max_length {max_length} exceeds the limit of embedding model {model_name}, using {limit}",
+                max_length=options.max_length,
+                model_name=model_name,
+                limit=limit,
+            )
+        else:
+            tokenizer.enable_truncation(max_length=options.max_length)
+    return model
+
+
 def get_embedding_model(model_name: str = "BAAI/bge-small-en-v1.5") -> TextEmbedding:
     """Get or create cached instance of embedding model
 
@@ -14,5 +79,62 @@ def get_embedding_model(model_name: str = "BAAI/bge-small-en-v1.5") -> TextEmbed
     """
     global _embedding_models
     if model_name not in _embedding_models:
-        _embedding_models[model_name] = TextEmbedding(model_name=model_name)
+        _embedding_models[model_name] = build_embedding_model(model_name, settings.get_embedding_options(model_name))
     return _embedding_models[model_name]
+
+
+def download_embedding_model(model_name: str) -> None:
+    """Download the files of an embedding model into the model cache without creating an ONNX session
+
+    Args:
+        model_name: Name of the fastembed model to download
+    """
+    options = settings.get_embedding_options(model_name)
+    description = TextEmbedding._get_model_description(resolve_model_name(model_name, bool(options.quantized)))
+    TextEmbedding.download_model(description, str(define_cache_dir(settings.embedding_model_cache_dir)))
+
+
+def embedding_cache_id(model_name: str) -> str:
+    """Identify a model together with the options that change its vectors, for use in cache keys"""
+    options = settings.get_embedding_options(model_name)
+    return f"{resolve_model_name(model_name, bool(options.quantized))}@{options.max_length or 'default'}"
+
+
+async def embed_texts(
+    texts: list[str], model_name: str = "BAAI/bge-small-en-v1.5", cache: bool = True
+) -> list[list[float]]:
+    """Embed texts, reusing cached embeddings and computing only the misses
+
+    Inference runs in a worker thread so the event loop keeps serving other requests. With the `parallel`
+    option set, fastembed additionally starts a fresh process pool for every call with more than
+    `batch_size` uncached texts.
+
+    Args:
+        texts: Texts to embed
+        model_name: Name of the fastembed model to use
+        cache: Use the embedding cache; off for bulk texts such as upserted documents, which would evict queries
+
+    Returns:
+        One vector per text, in input order
+    """
+    cache_id = embedding_cache_id(model_name)
+    vectors = await get_cached_embeddings(cache_id, texts) if cache else [None] * len(texts)
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+    if missing:
+        model = get_embedding_model(model_name)
+        options = settings.get_embedding_options(model_name)
+        missing_texts = [texts[i] for i in missing]
+        # fastembed returns a generator
+        embeddings = await asyncio.to_thread(
+            lambda: [
+                e.tolist()
+                for e in model.embed(missing_texts, batch_size=options.batch_size, parallel=options.parallel)
+            ]
+        )
+        for i, embedding in zip(missing, embeddings):
+            vectors[i] = embedding
+        if cache:
+            await put_cached_embeddings(cache_id, missing_texts, embeddings)
+
+    return vectors
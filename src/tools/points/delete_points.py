@@ -1,8 +1,9 @@
 from typing import Any
 
-import logfire
 from qdrant_client.http.models import PointIdsList
 
+from src.cache import collection_metadata_key, invalidate_metadata
+from src.telemetry import tool_span
 from src.tools.collection.client import get_qdrant_client
 
 
@@ -16,8 +17,10 @@ async def delete_points(collection_name: str, ids: list[int | str]) -> dict[str,
     Returns:
         Operation status
     """
-    with logfire.span("Delete Qdrant points", collection_name=collection_name, point_ids=ids) as span:
+    with tool_span("delete_points", "Delete Qdrant points", collection_name=collection_name, point_ids=ids) as span:
         client = await get_qdrant_client()
         result = await client.delete(collection_name=collection_name, points_selector=PointIdsList(points=ids))
+        # Cached collection info holds the point counts
+        await invalidate_metadata(collection_metadata_key(client.cache_namespace, collection_name))
 
         return {"operation_id": result.operation_id, "status": result.status.value}
@@ -1,33 +1,44 @@
 from typing import Any
 
-import logfire
-
+from src.telemetry import tool_span
 from src.tools.collection.client import get_qdrant_client
+from src.tools.points.shaping import truncate_payload
 
 
-async def get_points(collection_name: str, ids: list[int | str]) -> list[dict[str, Any]]:
+async def get_points(
+    collection_name: str,
+    ids: list[int | str],
+    with_vectors: bool = True,
+    payload_fields: list[str] | None = None,
+    max_text_length: int | None = None,
+) -> list[dict[str, Any]]:
     """Retrieve specific points by their IDs
 
     Args:
         collection_name: Name of the collection
         ids: List of point IDs (integers or UUID strings)
+        with_vectors: Include vectors in the response (default true); disable to save tokens
+        payload_fields: Only return these payload keys (default: whole payload)
+        max_text_length: Truncate string payload values to this many characters
 
     Returns:
         list of points with their payload and vector info
     """
-    with logfire.span("Get Qdrant points", collection_name=collection_name, point_ids=ids) as span:
+    with tool_span("get_points", "Get Qdrant points", collection_name=collection_name, point_ids=ids) as span:
         client = await get_qdrant_client()
-        points = await client.retrieve(collection_name=collection_name, ids=ids, with_payload=True, with_vectors=True)
+        points = await client.retrieve(
+            collection_name=collection_name,
+            ids=ids,
+            with_payload=payload_fields if payload_fields is not None else True,
+            with_vectors=with_vectors,
+        )
 
         results = []
         for point in points:
-            results.append(
-                {
-                    "id": point.id,
-                    "payload": point.payload,
-                    "vector": point.vector,
-                }
-            )
+            result = {"id": point.id, "payload": truncate_payload(point.payload, max_text_length)}
+            if with_vectors:
+                result["vector"] = point.vector
+            results.append(result)
 
         span.set_attribute("found_count", len(results))
         return results
@@ -0,0 +1,206 @@
+"""Server-side recommendation, discovery and grouped queries that take point IDs as examples"""
+
+from typing import Annotated, Any, Literal, TypedDict
+
+from pydantic import Field
+from qdrant_client import models
+
+from src.telemetry import tool_span
+from src.tools.collection.client import get_qdrant_client
+from src.tools.points.common import embed_texts
+from src.tools.points.shaping import truncate_payload
+
+
+class ExamplePair(TypedDict):
+    """Context pair for discover_points: results should be closer to positive than to negative"""
+
+    positive: Annotated[int | str, Field(description="ID of the point on the preferred side")]
+    negative: Annotated[int | str, Field(description="ID of the point on the avoided side")]
+
+
+def _serialize(point: models.ScoredPoint, max_text_length: int | None) -> dict[str, Any]:
+    return {
+        "id": point.id,
+        "score": point.score,
+        "payload": truncate_payload(point.payload, max_text_length),
+        "version": point.version,
+    }
+
+
+async def recommend_points(
+    collection_name: str,
+    positive: list[int | str],
+    negative: list[int | str] | None = None,
+    limit: int = 10,
+    strategy: Literal["average_vector", "best_score", "sum_scores"] = "average_vector",
+    score_threshold: float | None = None,
+    payload_fields: list[str] | None = None,
+    max_text_length: int | None = None,
+) -> list[dict[str, Any]]:
+    """Find points similar to the positive example points and dissimilar to the negative ones
+
+    Use this instead of fetching vectors with get_points and searching again: Qdrant resolves the example
+    IDs to vectors on the server, so no vectors travel through this tool.
+
+    Args:
+        collection_name: Name of the collection
+        positive: IDs of points the results should be similar to
+        negative: IDs of points the results should be dissimilar to
+        limit: Max number of results (default 10)
+        strategy: How examples are combined: average_vector (default), best_score or sum_scores
+        score_threshold: Minimum score threshold
+        payload_fields: Only return these payload keys (default: whole payload)
+        max_text_length: Truncate string payload values to this many characters
+
+    Returns:
+        List of matching points with scores, excluding the example points
+    """
+    with tool_span(
+        "recommend_points",
+        "Recommend Qdrant points",
+        collection_name=collection_name,
+        positive_count=len(positive),
+        negative_count=len(negative or []),
+    ) as span:
+        if not positive:
+            raise ValueError("positive must contain at least one point ID")
+
+        client = await get_qdrant_client()
+        response = await client.query_points(
+            collection_name=collection_name,
+            query=models.RecommendQuery(
+                recommend=models.RecommendInput(
+                    positive=positive,
+                    negative=negative or None,
+                    strategy=models.RecommendStrategy(strategy),
+                )
+            ),
+            limit=limit,
+            score_threshold=score_threshold,
+            with_payload=payload_fields if payload_fields is not None else True,
+        )
+
+        serialized_results = [_serialize(point, max_text_length) for point in response.points]
+
+        span.set_attribute("results_count", len(serialized_results))
+        return serialized_results
+
+
+async def discover_points(
+    collection_name: str,
+    context: list[ExamplePair],
+    target: int | str | None = None,
+    limit: int = 10,
+    payload_fields: list[str] | None = None,
+    max_text_length: int | None = None,
+) -> list[dict[str, Any]]:
+    """Discover points in the region of the vector space outlined by positive/negative example pairs
+
+    With a target, results are ranked by closeness to the target point while staying on the positive side of
+    every context pair. Without a target, this is a pure context search that returns points from the preferred
+    region.
+
+    Args:
+        collection_name: Name of the collection
+        context: List of example pairs, each a dict with "positive" and "negative" point IDs
+        target: ID of the point results should be close to (optional)
+        limit: Max number of results (default 10)
+        payload_fields: Only return these payload keys (default: whole payload)
+        max_text_length: Truncate string payload values to this many characters
+
+    Returns:
+        List of matching points with scores
+    """
+    with tool_span(
+        "discover_points",
+        "Discover Qdrant points",
+        collection_name=collection_name,
+        context_pairs=len(context),
+        target=target,
+    ) as span:
+        pairs = [models.ContextPair(positive=pair["positive"], negative=pair["negative"]) for pair in context]
+        if target is not None:
+            query = models.DiscoverQuery(discover=models.DiscoverInput(target=target, context=pairs))
+        else:
+            query = models.ContextQuery(context=pairs)
+
+        client = await get_qdrant_client()
+        response = await client.query_points(
+            collection_name=collection_name,
+            query=query,
+            limit=limit,
+            with_payload=payload_fields if payload_fields is not None else True,
+        )
+
+        serialized_results = [_serialize(point, max_text_length) for point in response.points]
+
+        span.set_attribute("results_count", len(serialized_results))
+        return serialized_results
+
+
+async def search_point_groups(
+    collection_name: str,
+    group_by: str,
+    query_text: str | None = None,
+    positive: list[int | str] | None = None,
+    negative: list[int | str] | None = None,
+    limit: int = 10,
+    group_size: int = 3,
+    score_threshold: float | None = None,
+    embedding_model: str = "BAAI/bge-small-en-v1.5",
+    payload_fields: list[str] | None = None,
+    max_text_length: int | None = None,
+) -> list[dict[str, Any]]:
+    """Search points and group the results by a payload key, e.g. one entry per document for chunked texts
+
+    Query either by text (embedded with the given model) or by positive/negative example point IDs.
+
+    Args:
+        collection_name: Name of the collection
+        group_by: Payload key to group results by
+        query_text: Text to search for (mutually exclusive with positive/negative)
+        positive: IDs of points the results should be similar to
+        negative: IDs of points the results should be dissimilar to (only with positive)
+        limit: Max number of groups (default 10)
+        group_size: Max number of points per group (default 3)
+        score_threshold: Minimum score threshold
+        embedding_model: Fastembed model name for query_text (default: BAAI/bge-small-en-v1.5)
+        payload_fields: Only return these payload keys (default: whole payload)
+        max_text_length: Truncate string payload values to this many characters
+
+    Returns:
+        List of groups, each with the group key and its best-scoring points
+    """
+    with tool_span(
+        "search_point_groups", "Search Qdrant point groups", collection_name=collection_name, group_by=group_by
+    ) as span:
+        if (query_text is None) == (positive is None):
+            raise ValueError("Provide exactly one of query_text or positive example IDs")
+        if query_text is not None and negative:
+            raise ValueError("negative example IDs can only be combined with positive ones, not with query_text")
+        if positive is not None and not positive:
+            raise ValueError("positive must contain at least one point ID")
+
+        if query_text is not None:
+            query = (await embed_texts([query_text], embedding_model))[0]
+        else:
+            query = models.RecommendQuery(recommend=models.RecommendInput(positive=positive, negative=negative))
+
+        client = await get_qdrant_client()
+        response = await client.query_points_groups(
+            collection_name=collection_name,
+            group_by=group_by,
+            query=query,
+            limit=limit,
+            group_size=group_size,
+            score_threshold=score_threshold,
+            with_payload=payload_fields if payload_fields is not None else True,
+        )
+
+        groups = [
+            {"group": group.id, "points": [_serialize(point, max_text_length) for point in group.hits]}
+            for group in response.groups
+        ]
+
+        span.set_attribute("groups_count", len(groups))
+        return groups
@@ -1,9 +1,22 @@
 from typing import Any
 
-import logfire
-
+from src.telemetry import child_span, tool_span
 from src.tools.collection.client import get_qdrant_client
-from src.tools.points.common import get_embedding_model
+from src.tools.points.common import embed_texts
+from src.tools.points.shaping import (
+    CANDIDATE_MULTIPLIER,
+    dedupe_indices,
+    mmr_indices,
+    normalize_scores,
+    truncate_payload,
+)
+
+
+def _dense_vector(vector: Any) -> list[float] | None:
+    # The default (unnamed) vector comes back under the "" key when the collection also has sparse vectors
+    if isinstance(vector, dict):
+        vector = vector.get("")
+    return vector if isinstance(vector, list) else None
 
 
 async def search_points(
@@ -12,6 +25,11 @@ async def search_points(
     limit: int = 10,
     score_threshold: float | None = None,
     embedding_model: str = "BAAI/bge-small-en-v1.5",
+    payload_fields: list[str] | None = None,
+    max_text_length: int | None = None,
+    dedupe_by: str | None = None,
+    diversity: float | None = None,
+    normalize: bool = False,
 ) -> list[dict[str, Any]]:
     """Search for points using text query (converts text to vector)
 
@@ -25,32 +43,70 @@ async def search_points(
         limit: Max number of results (default 10)
         score_threshold: Minimum score threshold
         embedding_model: Fastembed model name (default: BAAI/bge-small-en-v1.5)
+        payload_fields: Only return these payload keys (default: whole payload)
+        max_text_length: Truncate string payload values to this many characters
+        dedupe_by: Payload key; keep only the best-scoring point for each of its values
+        diversity: MMR trade-off between 0 (pure relevance) and 1 (pure novelty); unset disables reranking
+        normalize: Min-max normalize the returned scores into [0, 1]
 
     Returns:
         List of matching points with scores
     """
-    with logfire.span("Search Qdrant points", collection_name=collection_name, query=query_text) as span:
-        with logfire.span("Generate embedding for query text") as embed_span:
-            model = get_embedding_model(embedding_model)
-            # fastembed returns a generator
-            embeddings = list(model.embed([query_text]))
-            vector = embeddings[0]
-
-        with logfire.span("Query Qdrant collection") as query_span:
+    with tool_span(
+        "search_points", "Search Qdrant points", collection_name=collection_name, query=query_text
+    ) as span:
+        if diversity is not None and not 0.0 <= diversity <= 1.0:
+            raise ValueError("diversity must be between 0 and 1")
+
+        with child_span("Generate embedding for query text") as embed_span:
+            vector = (await embed_texts([query_text], embedding_model))[0]
+
+        with child_span("Query Qdrant collection") as query_span:
+            with_payload: bool | list[str] = True
+            if payload_fields is not None:
+                # Project server-side; the dedupe key is needed even when not requested
+                with_payload = list(dict.fromkeys([*payload_fields, *([dedupe_by] if dedupe_by else [])]))
+
+            # Over-fetch when results are going to be filtered or reranked locally
+            reshaping = dedupe_by is not None or diversity is not None
             client = await get_qdrant_client()
             response = await client.query_points(
                 collection_name=collection_name,
-                query=vector.tolist(),
-                limit=limit,
+                query=vector,
+                limit=limit * CANDIDATE_MULTIPLIER if reshaping else limit,
                 score_threshold=score_threshold,
-                with_payload=True,
+                with_payload=with_payload,
+                with_vectors=diversity is not None,
             )
 
+        points = response.points
+        if dedupe_by is not None:
+            points = [points[i] for i in dedupe_indices([point.payload for point in points], dedupe_by)]
+        if diversity is not None and points:
+            vectors = [_dense_vector(point.vector) for point in points]
+            if any(candidate is None for candidate in vectors):
+                raise ValueError("diversity needs the dense default vector, which the collection's points do not have")
+            points = [points[i] for i in mmr_indices(vector, vectors, limit, diversity)]
+        points = points[:limit]
+
+        scores = [point.score for point in points]
+        if normalize:
+            scores = normalize_scores(scores)
+
         serialized_results = []
-        for point in response.points:
+        for point, score in zip(points, scores):
+            payload = point.payload
+            if payload and payload_fields is not None and dedupe_by and dedupe_by not in payload_fields:
+                payload = {key: value for key, value in payload.items() if key != dedupe_by}
             serialized_results.append(
-                {"id": point.id, "score": point.score, "payload": point.payload, "version": point.version}
+                {
+                    "id": point.id,
+                    "score": score,
+                    "payload": truncate_payload(payload, max_text_length),
+                    "version": point.version,
+                }
             )
 
+        span.set_attribute("candidates_count", len(response.points))
         span.set_attribute("results_count", len(serialized_results))
         return serialized_results
@@ -0,0 +1,101 @@
+"""Response shaping helpers for point results: truncation, deduplication, score normalization and MMR"""
+
+from typing import Any
+
+import numpy as np
+
+# How many candidates to fetch per requested result when deduplicating or reranking locally
+CANDIDATE_MULTIPLIER = 4
+
+
+def truncate_payload(payload: dict[str, Any] | None, max_text_length: int | None) -> dict[str, Any] | None:
+    """Truncate string values (including nested ones) to at most max_text_length characters, ellipsis included"""
+    if payload is None or max_text_length is None:
+        return payload
+    return {key: _truncate(value, max_text_length) for key, value in payload.items()}
+
+
+def _truncate(value: Any, max_text_length: int) -> Any:
+    if isinstance(value, str):
+        if len(value) <= max_text_length:
+            return value
+        # The ellipsis counts toward the limit
+        return value[: max_text_length - 1] + "…" if max_text_length > 0 else ""
+    if isinstance(value, dict):
+        return {key: _truncate(item, max_text_length) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_truncate(item, max_text_length) for item in value]
+    return value
+
+
+def dedupe_indices(payloads: list[dict[str, Any] | None], key: str) -> list[int]:
+    """Indices of the first point for each distinct value of a payload key
+
+    Points without the key are never treated as duplicates. Input order (best score first) is kept.
+    """
+    seen = set()
+    keep = []
+    for i, payload in enumerate(payloads):
+        value = (payload or {}).get(key)
+        if value is not None:
+            marker = repr(value)
+            if marker in seen:
+                continue
+            seen.add(marker)
+        keep.append(i)
+    return keep
+
+
+def normalize_scores(scores: list[float]) -> list[float]:
+    """Min-max normalize scores into [0, 1], all ones when every score is equal"""
+    if not scores:
+        return []
+    values = np.asarray(scores, dtype=np.float64)
+    spread = values.max() - values.min()
+    if spread == 0:
+        return np.ones_like(values).tolist()
+    return ((values - values.min()) / spread).tolist()
+
+
+def mmr_indices(query: list[float], vectors: list[list[float]], limit: int, diversity: float) -> list[int]:
+    """Select up to limit candidates by Maximal Marginal Relevance
+
+    Cosine similarities to the query and between all candidates are computed in one vectorized pass;
+    the greedy selection then only updates a running max-similarity vector.
+
+    Args:
+        query: Query vector
+        vectors: Candidate vectors, best match first
+        limit: Number of candidates to select
+        diversity: 0 ranks purely by relevance, 1 purely by novelty
+
+    Returns:
+        Indices of the selected candidates in selection order
+    """
+    if not vectors:
+        return []
+
+    candidates = _unit_rows(np.asarray(vectors, dtype=np.float32))
+    relevance = candidates @ _unit_rows(np.asarray(query, dtype=np.float32)[None, :])[0]
+    similarity = candidates @ candidates.T
+
+    selected = [int(np.argmax(relevance))]
+    available = np.ones(len(candidates), dtype=bool)
+    available[selected[0]] = False
+    redundancy = similarity[selected[0]].copy()
+
+    while len(selected) < min(limit, len(candidates)):
+        mmr = (1 - diversity) * relevance - diversity * redundancy
+        mmr[~available] = -np.inf
+        best = int(np.argmax(mmr))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+
+    return selected
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
@@ -1,14 +1,40 @@
+import hashlib
+import json
+import uuid
 from typing import Any
 
-import logfire
 from qdrant_client.http.models import PointStruct
 
+from src.cache import collection_metadata_key, invalidate_metadata
+from src.telemetry import tool_span
 from src.tools.collection.client import get_qdrant_client
-from src.tools.points.common import get_embedding_model
+from src.tools.points.common import embed_texts, embedding_cache_id
+
+# Payload key holding the hash of the content a point was last upserted with
+CONTENT_HASH_KEY = "_content_hash"
+
+
+def content_hash(point: dict[str, Any], embedding_model: str) -> str:
+    """Hash everything that determines the stored point: text, payload, explicit vector and embedding model"""
+    content = {
+        "text": point.get("text"),
+        "payload": {key: value for key, value in (point.get("payload") or {}).items() if key != CONTENT_HASH_KEY},
+        "vector": point.get("vector"),
+        "model": embedding_cache_id(embedding_model) if "vector" not in point and "text" in point else None,
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _normalize_id(point_id: int | str) -> int | str:
+    # Compare UUIDs in canonical form, whatever form they were sent or stored in
+    return str(uuid.UUID(point_id)) if isinstance(point_id, str) else point_id
 
 
 async def upsert_points(
-    collection_name: str, points: list[dict[str, Any]], embedding_model: str = "BAAI/bge-small-en-v1.5"
+    collection_name: str,
+    points: list[dict[str, Any]],
+    embedding_model: str = "BAAI/bge-small-en-v1.5",
+    skip_unchanged: bool = False,
 ) -> dict[str, Any]:
     """Upsert points with automatic text embedding generation
 
@@ -24,14 +50,55 @@ async def upsert_points(
             - payload: dict of metadata (optional)
             - vector: list[float] (optional, overrides text embedding)
         embedding_model: Fastembed model name (default: BAAI/bge-small-en-v1.5)
+        skip_unchanged: Store a content hash in the payload and skip embedding and upload of points whose
+            content hash matches the stored one (default false)
 
     Returns:
-        Operation status
+        Operation status, with inserted, updated and skipped counts when skip_unchanged is set
     """
-    with logfire.span("Upsert Qdrant points", collection_name=collection_name, count=len(points)) as span:
-        model = get_embedding_model(embedding_model)
-
+    with tool_span(
+        "upsert_points", "Upsert Qdrant points", collection_name=collection_name, count=len(points)
+    ) as span:
         points_to_upsert = []
+        counts = {}
+
+        if skip_unchanged:
+            # Points without vector or text are never upserted below, so they are neither inserted nor updated.
+            # Of repeated IDs only the last copy is kept, as Qdrant would store it.
+            points = list(
+                {_normalize_id(point["id"]): point for point in points if "vector" in point or "text" in point}.values()
+            )
+            hashes = [content_hash(point, embedding_model) for point in points]
+
+            client = await get_qdrant_client()
+            existing = await client.retrieve(
+                collection_name=collection_name,
+                ids=[point["id"] for point in points],
+                with_payload=[CONTENT_HASH_KEY],
+                with_vectors=False,
+            )
+            stored_hashes = {
+                _normalize_id(record.id): (record.payload or {}).get(CONTENT_HASH_KEY) for record in existing
+            }
+
+            counts = {"inserted": 0, "updated": 0, "skipped": 0}
+            changed = []
+            for point, digest in zip(points, hashes):
+                point_id = _normalize_id(point["id"])
+                if point_id not in stored_hashes:
+                    counts["inserted"] += 1
+                elif stored_hashes[point_id] != digest:
+                    counts["updated"] += 1
+                else:
+                    counts["skipped"] += 1
+                    continue
+                # Copy, so the caller's points are left untouched and can be resent as they are
+                changed.append({**point, "payload": {**(point.get("payload") or {}), CONTENT_HASH_KEY: digest}})
+            points = changed
+
+            span.set_attributes(counts)
+            if not points:
+                return {"status": "no_changes", **counts}
 
         # separate points that need embedding
         texts_to_embed = []
@@ -43,9 +110,10 @@ async def upsert_points(
                 indices_to_embed.append(i)
 
         if texts_to_embed:
-            embeddings = list(model.embed(texts_to_embed))
+            # Documents are embedded once, caching them would only crowd out query embeddings
+            embeddings = await embed_texts(texts_to_embed, embedding_model, cache=False)
             for i, embedding in zip(indices_to_embed, embeddings):
-                points[i]["vector"] = embedding.tolist()
+                points[i]["vector"] = embedding
 
         for point in points:
             if "vector" not in point:
@@ -63,5 +131,7 @@ async def upsert_points(
 
         client = await get_qdrant_client()
         result = await client.upsert(collection_name=collection_name, points=points_to_upsert)
+        # Cached collection info holds the point counts
+        await invalidate_metadata(collection_metadata_key(client.cache_namespace, collection_name))
 
-        return {"operation_id": result.operation_id, "status": result.status.value}
+        return {"operation_id": result.operation_id, "status": result.status.value, **counts}
@@ -5,6 +5,7 @@ from typing import Any
 
 import logfire
 
+from src.telemetry import tool_span
 from src.tools.collection.client import get_qdrant_client
 
 
@@ -19,19 +20,22 @@ async def status() -> dict[str, Any]:
         - qdrant_available: boolean
         - latency_ms: response time in milliseconds
         - collections_count: number of collections (if available)
+        - upstream: circuit breaker state and in-flight calls for the Qdrant URL
         - error: error message if unhealthy
     """
-    with logfire.span("Health check") as span:
+    with tool_span("status", "Health check") as span:
         status_info = {
             "status": "unhealthy",
             "qdrant_available": False,
             "latency_ms": None,
             "collections_count": None,
+            "upstream": None,
             "error": None,
         }
 
         try:
             client = await get_qdrant_client()
+            status_info["upstream"] = client.policy.state()
 
             # Measure latency
             start_time = time.perf_counter()
@@ -46,16 +50,21 @@ async def status() -> dict[str, Any]:
                     "qdrant_available": True,
                     "latency_ms": round(latency_ms, 2),
                     "collections_count": len(collections.collections),
+                    "upstream": client.policy.state(),
                 }
             )
 
             span.set_attribute("status", "healthy")
             span.set_attribute("latency_ms", status_info["latency_ms"])
             span.set_attribute("collections_count", status_info["collections_count"])
+            span.set_attribute("circuit_state", status_info["upstream"]["circuit_state"])
 
         except Exception as e:
             error_msg = f"{type(e).__name__}: {str(e)}"
             status_info["error"] = error_msg
+            if status_info["upstream"] is not None:
+                # Refresh so a failure that just opened the circuit is reported
+                status_info["upstream"] = client.policy.state()
 
             span.set_attribute("status", "unhealthy")
             span.set_attribute("error", error_msg)